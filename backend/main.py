@@ -1,12 +1,46 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+import numpy as np
+import orjson
 import pandas as pd
+import pyarrow as pa
 import os
-from typing import Optional
+import shutil
+from typing import NamedTuple, Optional
 import tempfile
-import io
 
-app = FastAPI(title="Transfer Guru API")
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered by orjson (C encoder, understands numpy scalars)"""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_parse_executor()
+    # Restore the last published dataset instead of waiting for a re-upload
+    await run_in_threadpool(load_snapshot)
+    try:
+        yield
+    finally:
+        PARSE_EXECUTOR.shutdown()
+
+
+app = FastAPI(
+    title="Transfer Guru API",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -17,11 +51,30 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
-# Global dataframe storage
-DATA_STORE = {
-    "df": None,
-    "filename": None
-}
+
+class DataSnapshot(NamedTuple):
+    """One loaded dataset; replaced as a whole, only its result cache grows"""
+    df: Optional[pd.DataFrame]
+    filename: Optional[str]
+    filtered: dict
+    version: Optional[str]  # doubles as the ETag
+    results: OrderedDict  # pivot/summary results for this data (LRU)
+
+
+# Per-process view of the shared snapshot. set_data swaps it with a single
+# assignment, so handlers that read it once never mix two uploads
+CURRENT_DATA = DataSnapshot(None, None, {}, None, OrderedDict())
+
+# Parsed data is published as a Parquet snapshot so that every uvicorn
+# worker serves the same dataset, whichever worker handled the upload
+DATA_SNAPSHOT_PATH = os.environ.get(
+    "DATA_SNAPSHOT_PATH", os.path.join(tempfile.gettempdir(), "transfer_guru.parquet")
+)
+
+RESULT_CACHE_SIZE = 64
+
+# Serializes snapshot reloads so concurrent requests don't each parse it
+SNAPSHOT_RELOAD_LOCK = asyncio.Lock()
 
 # Column names we need
 COLUMNS_NEEDED = [
@@ -31,15 +84,50 @@ COLUMNS_NEEDED = [
 
 HEADER_ROW = 15  # 0-indexed row where headers are
 
+PIVOT_VALUE_COLUMNS = ["amount", "fee", "psp_buy_fee", "count"]
+
+MONEY_COLUMNS = ["amount", "fee", "psp_buy_fee"]
+
+# Both pivot views are built from one aggregate over these keys
+PIVOT_KEYS = ["acquirer", "legal_name", "currency"]
+
+# Largest key space aggregated with dense per-bucket arrays (8 MiB each);
+# sparser combinations are compacted with np.unique first
+DENSE_BUCKET_LIMIT = 1 << 20
+
+CATEGORICAL_COLUMNS = ['type', 'status', 'currency', 'acquirer', 'legal_name', 'brand_name']
+
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB per read when spooling uploads to disk
+
+# xlsx parsing is CPU-bound, so run it in worker processes rather than threads.
+# The pool is created in lifespan and replaced if a worker process dies
+PARSE_WORKERS = 2
+PARSE_EXECUTOR: Optional[ProcessPoolExecutor] = None
+
+OPERATION_NAMES = {
+    1: "Purchase (paid/refunded/chargedback)",
+    2: "Refund (success)",
+    3: "Chargeback (success)",
+    4: "Payout (success)"
+}
+
+# Operation type → (transaction type, accepted statuses)
+OPERATION_FILTERS = {
+    1: ("purchase", ["paid", "refunded", "chargedback"]),
+    2: ("refund", ["success"]),
+    3: ("chargeback", ["success"]),
+    4: ("payout", ["success"])
+}
+
 
 def load_xlsx_data_fast(file_path_or_buffer) -> pd.DataFrame:
-    """Load xlsx file using pandas - much faster than openpyxl"""
+    """Load xlsx file using pandas with the Rust-backed calamine engine"""
     # Read only needed columns, skip first rows
     df = pd.read_excel(
         file_path_or_buffer,
         header=HEADER_ROW,
         usecols=lambda x: x in COLUMNS_NEEDED,
-        engine='openpyxl'
+        engine='calamine'
     )
 
     # Rename columns to snake_case
@@ -47,14 +135,18 @@ def load_xlsx_data_fast(file_path_or_buffer) -> pd.DataFrame:
 
     # Filter out rows with invalid type/status (formulas, nulls, numbers)
     df = df.dropna(subset=['type', 'status'])
-    df = df[df['type'].apply(lambda x: isinstance(x, str) and not str(x).startswith('='))]
-    df = df[df['status'].apply(lambda x: isinstance(x, str) and not str(x).startswith('='))]
-
-    # Normalize type and status
-    df['type'] = df['type'].str.lower().str.strip()
-    df['status'] = df['status'].str.lower().str.strip()
-
-    # Convert numeric columns
+    mask = pd.Series(True, index=df.index)
+    for col in ['type', 'status']:
+        mask &= df[col].map(type).eq(str) & ~df[col].str.startswith('=', na=False)
+    df = df.loc[mask].copy()
+
+    # Normalize type and status with Arrow's vectorized UTF-8 string kernels
+    for col in ['type', 'status']:
+        df[col] = df[col].astype('string[pyarrow]').str.lower().str.strip()
+
+    # Convert numeric columns. These stay float64 on purpose: float32 only
+    # carries ~7 significant digits, so single amounts above ~131k lose
+    # cents and float32 group sums over 1M rows drift by whole units.
     for col in ['amount', 'fee', 'psp_buy_fee']:
         if col in df.columns:
             df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
@@ -64,98 +156,244 @@ def load_xlsx_data_fast(file_path_or_buffer) -> pd.DataFrame:
         if col in df.columns:
             df[col] = df[col].fillna('').astype(str)
 
+    # Low-cardinality keys become categoricals so filters and groupbys
+    # compare integer codes instead of hashing Python strings
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+
     return df
 
 
+def set_data(df: pd.DataFrame, filename: str, version: str):
+    """Replace the loaded dataset and invalidate cached results"""
+    # The data is immutable between uploads, so filter each operation type once
+    filtered = {op_type: filter_by_operation_type(df, op_type) for op_type in OPERATION_NAMES}
+
+    # A fresh snapshot carries an empty result cache, so stale results go
+    # away with the data they were computed from
+    global CURRENT_DATA
+    CURRENT_DATA = DataSnapshot(df, filename, filtered, version, OrderedDict())
+
+
+def snapshot_version(stat: os.stat_result) -> str:
+    """ETag for a snapshot file; every publish renames in a new inode"""
+    return f'"{stat.st_ino:x}-{stat.st_mtime_ns:x}"'
+
+
+def publish_data(df: pd.DataFrame, filename: str):
+    """Write the dataset as the shared snapshot and load it in this worker"""
+    df.attrs["filename"] = filename
+
+    # Write a uniquely named file next to the target and rename it into place,
+    # so readers never see a partial file and concurrent uploads never collide
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(DATA_SNAPSHOT_PATH), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            df.to_parquet(tmp, index=False, compression="zstd")
+        version = snapshot_version(os.stat(tmp_path))
+        os.replace(tmp_path, DATA_SNAPSHOT_PATH)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    set_data(df, filename, version)
+
+
+def load_snapshot():
+    """Load the shared snapshot if it differs from what this worker holds
+
+    An unreadable snapshot (truncated, foreign or from an older schema) is
+    treated as no snapshot, so it can't stop workers from booting or
+    serving the data they already hold.
+    """
+    try:
+        with open(DATA_SNAPSHOT_PATH, "rb") as f:
+            # fstat the open file so the version matches the bytes we read
+            version = snapshot_version(os.fstat(f.fileno()))
+            if version == CURRENT_DATA.version:
+                return
+            df = pd.read_parquet(f)
+        set_data(df, df.attrs.get("filename"), version)
+    except (pa.ArrowInvalid, OSError, KeyError):
+        return
+
+
+async def sync_data():
+    """Pick up a snapshot published by another worker"""
+    if snapshot_is_current():
+        return
+
+    # Only one request reloads; the others wait and find the new data loaded
+    async with SNAPSHOT_RELOAD_LOCK:
+        if not snapshot_is_current():
+            await run_in_threadpool(load_snapshot)
+
+
+def snapshot_is_current() -> bool:
+    """Whether this worker already holds the snapshot on disk (or none exists)"""
+    try:
+        version = snapshot_version(os.stat(DATA_SNAPSHOT_PATH))
+    except OSError:
+        return True
+    return version == CURRENT_DATA.version
+
+
+def not_modified(request: Request, data: DataSnapshot) -> Optional[Response]:
+    """304 response when the client already holds this data version"""
+    if request.headers.get("if-none-match") == data.version:
+        return Response(status_code=304, headers={"ETag": data.version})
+    return None
+
+
+def cache_get(data: DataSnapshot, key):
+    """Return a cached result (marking it recently used) or None"""
+    if key not in data.results:
+        return None
+    data.results.move_to_end(key)
+    return data.results[key]
+
+
+def cache_put(data: DataSnapshot, key, value):
+    """Store a result, evicting the least recently used entry when full"""
+    data.results[key] = value
+    data.results.move_to_end(key)
+    while len(data.results) > RESULT_CACHE_SIZE:
+        data.results.popitem(last=False)
+
+
+def start_parse_executor():
+    """Create a fresh process pool for xlsx parsing"""
+    global PARSE_EXECUTOR
+    PARSE_EXECUTOR = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+
+
+async def parse_xlsx(file_path: str) -> pd.DataFrame:
+    """Parse an xlsx file in the process pool without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    executor = PARSE_EXECUTOR
+    try:
+        return await loop.run_in_executor(executor, load_xlsx_data_fast, file_path)
+    except BrokenProcessPool:
+        # A parse process died (e.g. OOM-killed), which breaks the pool for
+        # good; replace it so only this request fails
+        if PARSE_EXECUTOR is executor:
+            executor.shutdown(wait=False)
+            start_parse_executor()
+        raise
+
+
+def type_status_breakdown(df: pd.DataFrame) -> list:
+    """Count rows per (type, status) pair"""
+    type_counts = df.groupby(["type", "status"], observed=True).size().reset_index(name="count")
+    return type_counts.to_dict(orient="records")
+
+
 def filter_by_operation_type(df: pd.DataFrame, op_type: int) -> pd.DataFrame:
     """Filter data by operation type"""
-    if op_type == 1:
-        return df[
-            (df["type"] == "purchase") &
-            (df["status"].isin(["paid", "refunded", "chargedback"]))
-        ]
-    elif op_type == 2:
-        return df[(df["type"] == "refund") & (df["status"] == "success")]
-    elif op_type == 3:
-        return df[(df["type"] == "chargeback") & (df["status"] == "success")]
-    elif op_type == 4:
-        return df[(df["type"] == "payout") & (df["status"] == "success")]
-    else:
+    if op_type not in OPERATION_FILTERS:
         raise ValueError(f"Unknown operation type: {op_type}")
 
+    op_type_name, statuses = OPERATION_FILTERS[op_type]
+    mask = (df["type"] == op_type_name) & df["status"].isin(statuses)
+
+    # Boolean indexing gathers rows into fresh contiguous column blocks;
+    # a RangeIndex then replaces the sparse int64 row labels
+    return df.loc[mask].reset_index(drop=True)
 
-def build_pivot_by_acquirer(df: pd.DataFrame) -> dict:
-    """Build pivot table grouped by: Acquirer → Legal Name → Currency"""
-    if df.empty:
-        return {"groups": [], "totals": {"amount": 0, "fee": 0, "psp_buy_fee": 0, "count": 0}}
 
-    grouped = df.groupby(["acquirer", "legal_name", "currency"]).agg(
+def build_summary(df: pd.DataFrame) -> list:
+    """Build summary statistics for all operation types
+
+    One groupby over (type, status) scans the data once; each operation
+    type then sums its few matching rows of that small result.
+    """
+    by_type_status = df.groupby(["type", "status"], observed=True).agg(
         amount=("amount", "sum"),
         fee=("fee", "sum"),
         psp_buy_fee=("psp_buy_fee", "sum"),
-        count=("amount", "count")
-    ).reset_index()
+        count=("amount", "size")
+    )
+    types = by_type_status.index.get_level_values("type")
+    statuses = by_type_status.index.get_level_values("status")
 
-    result = {"groups": [], "totals": {
-        "amount": round(float(grouped["amount"].sum()), 2),
-        "fee": round(float(grouped["fee"].sum()), 2),
-        "psp_buy_fee": round(float(grouped["psp_buy_fee"].sum()), 2),
-        "count": int(grouped["count"].sum())
-    }}
+    summaries = []
+    for op_type, (op_type_name, op_statuses) in OPERATION_FILTERS.items():
+        totals = by_type_status[(types == op_type_name) & statuses.isin(op_statuses)].sum()
+        summaries.append({
+            "operation_type": op_type,
+            "name": OPERATION_NAMES[op_type],
+            "count": int(totals["count"]),
+            "total_amount": round(float(totals["amount"]), 2),
+            "total_fee": round(float(totals["fee"]), 2),
+            "total_psp_buy_fee": round(float(totals["psp_buy_fee"]), 2)
+        })
 
-    for acquirer in grouped["acquirer"].unique():
-        acq_data = grouped[grouped["acquirer"] == acquirer]
-        acq_group = {
-            "acquirer": acquirer,
-            "merchants": [],
-            "subtotals": {
-                "amount": round(float(acq_data["amount"].sum()), 2),
-                "fee": round(float(acq_data["fee"].sum()), 2),
-                "psp_buy_fee": round(float(acq_data["psp_buy_fee"].sum()), 2),
-                "count": int(acq_data["count"].sum())
-            }
-        }
+    return summaries
 
-        for legal_name in acq_data["legal_name"].unique():
-            merchant_data = acq_data[acq_data["legal_name"] == legal_name]
-            merchant_group = {
-                "legal_name": legal_name,
-                "currencies": [],
-                "subtotals": {
-                    "amount": round(float(merchant_data["amount"].sum()), 2),
-                    "fee": round(float(merchant_data["fee"].sum()), 2),
-                    "psp_buy_fee": round(float(merchant_data["psp_buy_fee"].sum()), 2),
-                    "count": int(merchant_data["count"].sum())
-                }
-            }
 
-            for _, row in merchant_data.iterrows():
-                merchant_group["currencies"].append({
-                    "currency": row["currency"],
-                    "amount": round(float(row["amount"]), 2),
-                    "fee": round(float(row["fee"]), 2),
-                    "psp_buy_fee": round(float(row["psp_buy_fee"]), 2),
-                    "count": int(row["count"])
-                })
+def aggregate_by_keys(df: pd.DataFrame, keys: list) -> pd.DataFrame:
+    """Sum amount/fee/psp_buy_fee and count rows per combination of keys
 
-            acq_group["merchants"].append(merchant_group)
+    The keys are categoricals, so each row's codes fold into one linear
+    bucket id and np.bincount computes all four reductions without pandas
+    groupby intermediates. Bucket ids ascend in key order, so the rows
+    come out sorted the same way groupby(sort=True) would return them.
+    """
+    codes = [df[key].cat.codes.to_numpy() for key in keys]
+    categories = [df[key].cat.categories for key in keys]
+    shape = tuple(len(cats) for cats in categories)
 
-        result["groups"].append(acq_group)
+    bucket = np.ravel_multi_index(codes, shape)
+    if np.prod(shape) > DENSE_BUCKET_LIMIT:
+        # Too many combinations for dense arrays: renumber the occupied ones
+        occupied, bucket = np.unique(bucket, return_inverse=True)
+        count = np.bincount(bucket)
+        used = slice(None)
+    else:
+        count = np.bincount(bucket, minlength=int(np.prod(shape)))
+        occupied = used = np.flatnonzero(count)
 
-    return result
+    grouped = {
+        key: pd.Categorical.from_codes(key_codes, cats)
+        for key, key_codes, cats in zip(keys, np.unravel_index(occupied, shape), categories)
+    }
+    for col in ["amount", "fee", "psp_buy_fee"]:
+        sums = np.bincount(bucket, weights=df[col].to_numpy(), minlength=len(count))
+        grouped[col] = sums[used]
+    grouped["count"] = count[used]
 
+    return pd.DataFrame(grouped)
 
-def build_pivot_by_merchant(df: pd.DataFrame) -> dict:
-    """Build pivot table grouped by: Legal Name → Acquirer → Currency"""
-    if df.empty:
-        return {"groups": [], "totals": {"amount": 0, "fee": 0, "psp_buy_fee": 0, "count": 0}}
 
-    grouped = df.groupby(["legal_name", "acquirer", "currency"]).agg(
-        amount=("amount", "sum"),
-        fee=("fee", "sum"),
-        psp_buy_fee=("psp_buy_fee", "sum"),
-        count=("amount", "count")
-    ).reset_index()
+def aggregate_pivot(df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate filtered rows once for both pivot views"""
+    return aggregate_by_keys(df, PIVOT_KEYS)
+
+
+def round_money(frame: pd.DataFrame) -> pd.DataFrame:
+    """Round the money columns to cents with Python's round()
+
+    Totals, subtotals, leaves and summaries all use round(), so a subtotal
+    over a single leaf always equals that leaf. DataFrame.round(2) is
+    avoided because numpy scales by 100 and rounds half to even, which
+    disagrees with round() on ties and near-ties (e.g. 2.675, 7.705).
+    """
+    rounded = frame.copy()
+    rounded[MONEY_COLUMNS] = frame[MONEY_COLUMNS].map(lambda value: round(value, 2))
+    return rounded
+
+
+def build_pivot(grouped: pd.DataFrame, outer_key: str, inner_key: str, children_key: str) -> dict:
+    """Build pivot table grouped by: outer_key → inner_key → Currency
+
+    Takes the output of aggregate_pivot, reorders it by the view's key
+    hierarchy and assembles the tree in a single linear walk that opens a
+    new node whenever a key changes. Subtotals for both levels come from
+    vectorized groupbys up front.
+    """
+    if grouped.empty:
+        return {"groups": [], "totals": {"amount": 0, "fee": 0, "psp_buy_fee": 0, "count": 0}}
 
     result = {"groups": [], "totals": {
         "amount": round(float(grouped["amount"].sum()), 2),
@@ -164,46 +402,61 @@ def build_pivot_by_merchant(df: pd.DataFrame) -> dict:
         "count": int(grouped["count"].sum())
     }}
 
-    for legal_name in grouped["legal_name"].unique():
-        merchant_data = grouped[grouped["legal_name"] == legal_name]
-        merchant_group = {
-            "legal_name": legal_name,
-            "acquirers": [],
-            "subtotals": {
-                "amount": round(float(merchant_data["amount"].sum()), 2),
-                "fee": round(float(merchant_data["fee"].sum()), 2),
-                "psp_buy_fee": round(float(merchant_data["psp_buy_fee"].sum()), 2),
-                "count": int(merchant_data["count"].sum())
+    # Re-aggregate the (small) grouped frame for each level's subtotals
+    outer_totals = grouped.groupby(outer_key, observed=True)[PIVOT_VALUE_COLUMNS].sum()
+    inner_totals = grouped.groupby([outer_key, inner_key], observed=True)[PIVOT_VALUE_COLUMNS].sum()
+    outer_subtotals = round_money(outer_totals).to_dict(orient="index")
+    inner_subtotals = round_money(inner_totals).to_dict(orient="index")
+
+    # Sorting returns a copy, so the shared aggregate is never modified.
+    # Totals are summed from the unrounded values above; now round the
+    # leaves once so the walk can emit them as-is
+    leaves = round_money(grouped.sort_values([outer_key, inner_key, "currency"]))
+    leaves["count"] = leaves["count"].astype("int64")
+
+    # Plain tuples of native Python scalars, no per-row Series or numpy boxing
+    columns = [outer_key, inner_key, "currency", "amount", "fee", "psp_buy_fee", "count"]
+    rows = leaves[columns].itertuples(index=False, name=None)
+
+    outer_group = None
+    inner_group = None
+    for outer, inner, currency, amount, fee, psp_buy_fee, count in rows:
+        if outer_group is None or outer != outer_group[outer_key]:
+            outer_group = {
+                outer_key: outer,
+                children_key: [],
+                "subtotals": outer_subtotals[outer]
             }
-        }
+            result["groups"].append(outer_group)
+            inner_group = None
 
-        for acquirer in merchant_data["acquirer"].unique():
-            acq_data = merchant_data[merchant_data["acquirer"] == acquirer]
-            acq_group = {
-                "acquirer": acquirer,
+        if inner_group is None or inner != inner_group[inner_key]:
+            inner_group = {
+                inner_key: inner,
                 "currencies": [],
-                "subtotals": {
-                    "amount": round(float(acq_data["amount"].sum()), 2),
-                    "fee": round(float(acq_data["fee"].sum()), 2),
-                    "psp_buy_fee": round(float(acq_data["psp_buy_fee"].sum()), 2),
-                    "count": int(acq_data["count"].sum())
-                }
+                "subtotals": inner_subtotals[(outer, inner)]
             }
+            outer_group[children_key].append(inner_group)
+
+        inner_group["currencies"].append({
+            "currency": currency,
+            "amount": amount,
+            "fee": fee,
+            "psp_buy_fee": psp_buy_fee,
+            "count": count
+        })
 
-            for _, row in acq_data.iterrows():
-                acq_group["currencies"].append({
-                    "currency": row["currency"],
-                    "amount": round(float(row["amount"]), 2),
-                    "fee": round(float(row["fee"]), 2),
-                    "psp_buy_fee": round(float(row["psp_buy_fee"]), 2),
-                    "count": int(row["count"])
-                })
+    return result
 
-            merchant_group["acquirers"].append(acq_group)
 
-        result["groups"].append(merchant_group)
+def build_pivot_by_acquirer(grouped: pd.DataFrame) -> dict:
+    """Build pivot table grouped by: Acquirer → Legal Name → Currency"""
+    return build_pivot(grouped, "acquirer", "legal_name", "merchants")
 
-    return result
+
+def build_pivot_by_merchant(grouped: pd.DataFrame) -> dict:
+    """Build pivot table grouped by: Legal Name → Acquirer → Currency"""
+    return build_pivot(grouped, "legal_name", "acquirer", "acquirers")
 
 
 @app.get("/")
@@ -213,10 +466,12 @@ async def root():
 
 @app.get("/api/status")
 async def get_status():
+    await sync_data()
+    data = CURRENT_DATA
     return {
-        "loaded": DATA_STORE["df"] is not None,
-        "filename": DATA_STORE["filename"],
-        "row_count": len(DATA_STORE["df"]) if DATA_STORE["df"] is not None else 0
+        "loaded": data.df is not None,
+        "filename": data.filename,
+        "row_count": len(data.df) if data.df is not None else 0
     }
 
 
@@ -226,19 +481,20 @@ async def upload_file(file: UploadFile = File(...)):
     if not file.filename.endswith(".xlsx"):
         raise HTTPException(status_code=400, detail="Only .xlsx files are supported")
 
+    tmp_path = None
     try:
-        # Read file content into memory
-        content = await file.read()
-        file_buffer = io.BytesIO(content)
+        # Spool the upload to disk in chunks instead of buffering it in memory;
+        # the copy does blocking file I/O, so it runs off the event loop
+        with tempfile.NamedTemporaryFile("wb", suffix=".xlsx", delete=False) as tmp:
+            tmp_path = tmp.name
+            await run_in_threadpool(shutil.copyfileobj, file.file, tmp, UPLOAD_CHUNK_SIZE)
 
-        # Parse with pandas (faster)
-        df = load_xlsx_data_fast(file_buffer)
-        DATA_STORE["df"] = df
-        DATA_STORE["filename"] = file.filename
+        # Parse off the event loop so other requests keep being served
+        df = await parse_xlsx(tmp_path)
+        await run_in_threadpool(publish_data, df, file.filename)
 
         # Get stats
-        type_counts = df.groupby(["type", "status"]).size().reset_index(name="count")
-        stats = type_counts.to_dict(orient="records")
+        stats = await run_in_threadpool(type_status_breakdown, df)
 
         return {
             "success": True,
@@ -248,6 +504,9 @@ async def upload_file(file: UploadFile = File(...)):
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
+    finally:
+        if tmp_path is not None:
+            os.unlink(tmp_path)
 
 
 @app.post("/api/load-default")
@@ -258,12 +517,10 @@ async def load_default_file():
     if not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="Default file not found")
 
-    df = load_xlsx_data_fast(file_path)
-    DATA_STORE["df"] = df
-    DATA_STORE["filename"] = "tab.xlsx"
+    df = await parse_xlsx(file_path)
+    await run_in_threadpool(publish_data, df, "tab.xlsx")
 
-    type_counts = df.groupby(["type", "status"]).size().reset_index(name="count")
-    stats = type_counts.to_dict(orient="records")
+    stats = await run_in_threadpool(type_status_breakdown, df)
 
     return {
         "success": True,
@@ -275,70 +532,89 @@ async def load_default_file():
 
 @app.get("/api/pivot")
 async def get_pivot(
+    request: Request,
     operation_type: int,
     view_type: int = 1,
     currency: Optional[str] = None
 ):
     """Get pivot table data"""
-    if DATA_STORE["df"] is None:
+    await sync_data()
+    # Read the snapshot once; later awaits may see a newer one swapped in
+    data = CURRENT_DATA
+    if data.df is None:
         raise HTTPException(status_code=400, detail="No data loaded. Upload a file first.")
 
-    df = DATA_STORE["df"].copy()
-    df = filter_by_operation_type(df, operation_type)
-
-    if currency:
-        df = df[df["currency"] == currency.upper()]
-
-    if view_type == 1:
-        pivot = build_pivot_by_acquirer(df)
-    else:
-        pivot = build_pivot_by_merchant(df)
-
-    return {
+    if operation_type not in OPERATION_NAMES:
+        raise HTTPException(status_code=400, detail=f"Unknown operation type: {operation_type}")
+
+    if (response := not_modified(request, data)) is not None:
+        return response
+
+    key = ("pivot", operation_type, view_type, currency)
+    cached = cache_get(data, key)
+    if cached is not None:
+        return ORJSONResponse(cached, headers={"ETag": data.version})
+
+    # Both views share one aggregate per (operation type, currency); key it
+    # on the normalized currency so "usd" and "USD" reuse the same entry
+    currency_code = currency.upper() if currency else None
+    grouped_key = ("grouped", operation_type, currency_code)
+    grouped = cache_get(data, grouped_key)
+    if grouped is None:
+        # Pre-filtered at load time; aggregation never mutates its input
+        df = data.filtered[operation_type]
+        if currency_code:
+            df = df[df["currency"] == currency_code]
+        grouped = await run_in_threadpool(aggregate_pivot, df)
+        cache_put(data, grouped_key, grouped)
+
+    builder = build_pivot_by_acquirer if view_type == 1 else build_pivot_by_merchant
+    pivot = await run_in_threadpool(builder, grouped)
+
+    response = {
         "operation_type": operation_type,
         "view_type": view_type,
         "currency_filter": currency,
         "data": pivot
     }
+    cache_put(data, key, response)
+    # Returning the response object skips FastAPI's pure-Python jsonable_encoder
+    return ORJSONResponse(response, headers={"ETag": data.version})
 
 
 @app.get("/api/currencies")
 async def get_currencies():
     """Get list of unique currencies in the data"""
-    if DATA_STORE["df"] is None:
+    await sync_data()
+    data = CURRENT_DATA
+    if data.df is None:
         raise HTTPException(status_code=400, detail="No data loaded")
 
-    currencies = sorted(DATA_STORE["df"]["currency"].unique().tolist())
+    currencies = sorted(data.df["currency"].unique().tolist())
     return {"currencies": currencies}
 
 
 @app.get("/api/summary")
-async def get_summary():
+async def get_summary(request: Request):
     """Get summary statistics for all operation types"""
-    if DATA_STORE["df"] is None:
+    await sync_data()
+    # Read the snapshot once; later awaits may see a newer one swapped in
+    data = CURRENT_DATA
+    if data.df is None:
         raise HTTPException(status_code=400, detail="No data loaded")
 
-    df = DATA_STORE["df"]
-    summaries = []
-    operation_names = {
-        1: "Purchase (paid/refunded/chargedback)",
-        2: "Refund (success)",
-        3: "Chargeback (success)",
-        4: "Payout (success)"
-    }
+    if (response := not_modified(request, data)) is not None:
+        return response
 
-    for op_type in [1, 2, 3, 4]:
-        filtered = filter_by_operation_type(df, op_type)
-        summaries.append({
-            "operation_type": op_type,
-            "name": operation_names[op_type],
-            "count": len(filtered),
-            "total_amount": round(float(filtered["amount"].sum()), 2),
-            "total_fee": round(float(filtered["fee"].sum()), 2),
-            "total_psp_buy_fee": round(float(filtered["psp_buy_fee"].sum()), 2)
-        })
+    key = ("summary",)
+    cached = cache_get(data, key)
+    if cached is not None:
+        return ORJSONResponse(cached, headers={"ETag": data.version})
 
-    return {"summaries": summaries}
+    summaries = await run_in_threadpool(build_summary, data.df)
+    response = {"summaries": summaries}
+    cache_put(data, key, response)
+    return ORJSONResponse(response, headers={"ETag": data.version})
 
 
 if __name__ == "__main__":